@@ -4,6 +4,10 @@ import plotly.express as px
 import matplotlib.pyplot as plt
 from sklearn.feature_extraction.text import TfidfVectorizer
 from wordcloud import WordCloud
+from utils.sentiment_labels import apply_threshold, weekly_neg_percent
+from utils.change_points import detect_frustration_events
+from utils.version_labels import load_version_config
+from utils.search_index import open_search_index, search_reviews
 import os 
 
 github_token = st.secrets["github_token"]
@@ -21,12 +25,24 @@ def load_data():
     }
     data = {}
     for app, path in files.items():
-        df = pd.read_csv(path, parse_dates=["at"], low_memory=False)
+        df = pd.read_csv(path, parse_dates=["at"], dtype={"pos_prob": "float32"}, low_memory=False)
         df["week"] = df["at"].dt.to_period("W").apply(lambda r: r.start_time)
         data[app] = df
     return data
 
+# ---------- Search Index ----------
+@st.cache_resource
+def get_search_index(path):
+    return open_search_index(path)
+
 app_data = load_data()
+version_config = load_version_config()
+
+# ---------- Sentiment Threshold ----------
+threshold = st.sidebar.slider("Minimum confidence for POSITIVE/NEGATIVE", 0.5, 0.99, 0.5, 0.01,
+                              help="Reviews scored below this confidence are counted as NEUTRAL")
+for df in app_data.values():
+    apply_threshold(df, threshold)
 
 
 st.title("📊 App Review Frustration Dashboard")
@@ -39,16 +55,25 @@ with tabs[0]:
     st.header("📈 Weekly Frustration Timeline")
     app_choice = st.selectbox("Choose App", list(app_data.keys()))
     df = app_data[app_choice]
-    weekly = df.groupby("week")["sentiment"].value_counts().unstack().fillna(0)
-    weekly["neg_percent"] = (weekly.get("NEGATIVE", 0) / weekly.sum(axis=1)) * 100
-    weekly = weekly.reset_index()
+    weekly = weekly_neg_percent(df)
 
     fig = px.line(weekly, x="week", y="neg_percent", markers=True,
                   title=f"{app_choice} – % Negative Reviews Per Week",
                   labels={"neg_percent": "% Negative Reviews"})
     fig.update_layout(template="plotly_white")
+
+    # Overlay detected spikes and change-points
+    events = detect_frustration_events({app_choice: weekly}, version_config)
+    for kind, symbol, color in [("spike", "x", "red"), ("change_point", "diamond", "orange")]:
+        flagged = events[events["kind"] == kind]
+        fig.add_scatter(x=flagged["week"], y=flagged["neg_percent"], mode="markers",
+                        name=kind.replace("_", " ").title(),
+                        marker=dict(symbol=symbol, size=12, color=color))
     st.plotly_chart(fig, use_container_width=True)
 
+    with st.expander("🚨 Detected Spikes & Change-Points"):
+        st.dataframe(events)
+
 # ---------- Page 2: Drill-Down ----------
 with tabs[1]:
     st.header("🔎 Drill-Down Explorer")
@@ -78,6 +103,26 @@ with tabs[1]:
         wordcloud = WordCloud(width=800, height=300, background_color='white').generate(" ".join(texts))
         st.image(wordcloud.to_array(), caption="Word Cloud of Complaints", use_column_width=True)
 
+    # Full-text search over the indexed reviews
+    st.subheader("🔍 Search Reviews")
+    index_path = f"outputs/{app_choice.lower()}_search.db"
+    if not os.path.exists(index_path):
+        st.info("No search index found — run test_sentiment_classification.py to build it.")
+    else:
+        query = st.text_input('Keywords or "exact phrase"', key="drill_search")
+        col1, col2, col3 = st.columns(3)
+        scope_only = col1.checkbox("Only this week", value=True, key="drill_scope")
+        sentiment_filter = col2.selectbox("Sentiment", ["Any", "NEGATIVE", "POSITIVE", "NEUTRAL"], key="drill_sentiment")
+        page = col3.number_input("Page", min_value=1, value=1, step=1, key="drill_page")
+        if query:
+            max_count = 10000
+            results, total = search_reviews(get_search_index(index_path), query,
+                                            week=week_choice if scope_only else None,
+                                            sentiment=None if sentiment_filter == "Any" else sentiment_filter,
+                                            threshold=threshold, page=page, max_count=max_count)
+            st.write(f"{total}{'+' if total >= max_count else ''} matches")
+            st.dataframe(results)
+
 # ---------- Page 3: Complaint Analyzer ----------
 with tabs[2]:
     st.header("🔧 Complaint Analyzer")
@@ -113,10 +158,10 @@ with tabs[2]:
 with tabs[3]:
     st.header("📊 Multi-App Frustration Comparison")
     df_all = []
+    app_weekly = {}
     for app, df in app_data.items():
-        weekly = df.groupby("week")["sentiment"].value_counts().unstack().fillna(0)
-        weekly["neg_percent"] = (weekly.get("NEGATIVE", 0) / weekly.sum(axis=1)) * 100
-        weekly = weekly.reset_index()
+        weekly = weekly_neg_percent(df)
+        app_weekly[app] = weekly
         weekly["App"] = app
         df_all.append(weekly[["week", "neg_percent", "App"]])
     merged = pd.concat(df_all)
@@ -126,3 +171,6 @@ with tabs[3]:
                   labels={"neg_percent": "% Negative Reviews"})
     fig.update_layout(template="plotly_white")
     st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("🚨 Ranked Spikes & Change-Points Across Apps")
+    st.dataframe(detect_frustration_events(app_weekly, version_config))
@@ -4,6 +4,11 @@ import plotly.express as px
 import matplotlib.pyplot as plt
 from sklearn.feature_extraction.text import TfidfVectorizer
 from wordcloud import WordCloud
+from utils.sentiment_labels import apply_threshold, weekly_neg_percent
+from utils.change_points import detect_frustration_events
+from utils.version_labels import load_version_config
+from utils.search_index import open_search_index, search_reviews
+from utils.representative_reviews import precompute_slice_representatives
 import os 
 
 
@@ -22,12 +27,35 @@ def load_data():
     }
     data = {}
     for app, path in files.items():
-        df = pd.read_csv(path, parse_dates=["at"], low_memory=False)
+        df = pd.read_csv(path, parse_dates=["at"], dtype={"pos_prob": "float32"}, low_memory=False)
         df["week"] = df["at"].dt.to_period("W").apply(lambda r: r.start_time)
         data[app] = df
     return data
 
+# ---------- Search Index ----------
+@st.cache_resource
+def get_search_index(path):
+    return open_search_index(path)
+
+# Representative negative reviews per week: precomputed by the scoring pipeline for the
+# default threshold, recomputed (and cached) only when the slider is moved
+@st.cache_data
+def load_representatives(app, threshold):
+    path = f"outputs/{app.lower()}_representatives.csv"
+    if threshold == 0.5 and os.path.exists(path):
+        picks = pd.read_csv(path, dtype={"key": str})
+    else:
+        picks = precompute_slice_representatives(apply_threshold(load_data()[app], threshold), {"week": "week"})
+    return picks[picks["slice"] == "week"]
+
 app_data = load_data()
+version_config = load_version_config()
+
+# ---------- Sentiment Threshold ----------
+threshold = st.sidebar.slider("Minimum confidence for POSITIVE/NEGATIVE", 0.5, 0.99, 0.5, 0.01,
+                              help="Reviews scored below this confidence are counted as NEUTRAL")
+for df in app_data.values():
+    apply_threshold(df, threshold)
 
 st.title("📊 App Review  Dashboard")
 
@@ -39,9 +67,7 @@ with tabs[0]:
     st.header("📈 Weekly Negative Review Timeline")
     app_choice = st.selectbox("Choose App", list(app_data.keys()))
     df = app_data[app_choice]
-    weekly = df.groupby("week")["sentiment"].value_counts().unstack().fillna(0)
-    weekly["neg_percent"] = (weekly.get("NEGATIVE", 0) / weekly.sum(axis=1)) * 100
-    weekly = weekly.reset_index()
+    weekly = weekly_neg_percent(df)
 
     selected_week = st.selectbox("Select a week to drill down:", weekly["week"].astype(str))
 
@@ -49,8 +75,19 @@ with tabs[0]:
                   title=f"{app_choice} – % Negative Reviews Per Week",
                   labels={"neg_percent": "% Negative Reviews"})
     fig.update_layout(template="plotly_white")
+
+    # Overlay detected spikes and change-points
+    events = detect_frustration_events({app_choice: weekly}, version_config)
+    for kind, symbol, color in [("spike", "x", "red"), ("change_point", "diamond", "orange")]:
+        flagged = events[events["kind"] == kind]
+        fig.add_scatter(x=flagged["week"], y=flagged["neg_percent"], mode="markers",
+                        name=kind.replace("_", " ").title(),
+                        marker=dict(symbol=symbol, size=12, color=color))
     st.plotly_chart(fig, use_container_width=True)
 
+    with st.expander("🚨 Detected Spikes & Change-Points"):
+        st.dataframe(events)
+
     # Show additional details for the selected week
     st.subheader(f"🔹 Drill-down for {selected_week}")
     df["week"] = df["week"].astype(str)
@@ -77,9 +114,31 @@ with tabs[0]:
 
         # Representative Reviews
         st.subheader("💬 Representative User Reviews")
-        for i, row in selected_reviews.head(3).iterrows():
+        picks = load_representatives(app_choice, threshold)
+        picks = picks[picks["key"] == pd.to_datetime(selected_week).strftime("%Y-%m-%d")]
+        for i, row in df.loc[picks["row"]].iterrows():
             st.markdown(f"- _\"{row['content']}\"_")
 
+    # Full-text search over the indexed reviews
+    st.subheader("🔍 Search Reviews")
+    index_path = f"outputs/{app_choice.lower()}_search.db"
+    if not os.path.exists(index_path):
+        st.info("No search index found — run test_sentiment_classification.py to build it.")
+    else:
+        query = st.text_input('Keywords or "exact phrase"', key="timeline_search")
+        col1, col2, col3 = st.columns(3)
+        scope_only = col1.checkbox("Only this week", value=True, key="timeline_scope")
+        sentiment_filter = col2.selectbox("Sentiment", ["Any", "NEGATIVE", "POSITIVE", "NEUTRAL"], key="timeline_sentiment")
+        page = col3.number_input("Page", min_value=1, value=1, step=1, key="timeline_page")
+        if query:
+            max_count = 10000
+            results, total = search_reviews(get_search_index(index_path), query,
+                                            week=selected_week if scope_only else None,
+                                            sentiment=None if sentiment_filter == "Any" else sentiment_filter,
+                                            threshold=threshold, page=page, max_count=max_count)
+            st.write(f"{total}{'+' if total >= max_count else ''} matches")
+            st.dataframe(results)
+
 
 
 # ---------- Page 3: Complaint Analyzer ----------
@@ -5,6 +5,12 @@ import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 from sklearn.feature_extraction.text import TfidfVectorizer
 from wordcloud import WordCloud
+from utils.sentiment_labels import apply_threshold, weekly_neg_percent
+from utils.change_points import detect_frustration_events
+from utils.version_labels import load_version_config
+from utils.search_index import open_search_index, search_reviews
+from utils.representative_reviews import precompute_slice_representatives
+import os
 
 st.set_page_config(page_title="Sentiment Analysis Dashboard", layout="wide")
 
@@ -12,13 +18,35 @@ st.set_page_config(page_title="Sentiment Analysis Dashboard", layout="wide")
 @st.cache_data
 
 def load_data():
-    df = pd.read_csv("outputs/zoom_final.csv", parse_dates=["at"], low_memory=False)
+    df = pd.read_csv("outputs/zoom_final.csv", parse_dates=["at"], dtype={"pos_prob": "float32"}, low_memory=False)
     df = df[df["app_version_mapped"].notna() & df["sentiment"].notna() & df["clean_review"].notna()]
     df["week"] = df["at"].dt.to_period("W").apply(lambda r: r.start_time)
     return df
 
+# ---------- Search Index ----------
+@st.cache_resource
+def get_search_index(path):
+    return open_search_index(path)
+
+# Representative negative reviews per version: precomputed by the scoring pipeline for
+# the default threshold, recomputed (and cached) only when the slider is moved
+@st.cache_data
+def load_representatives(threshold):
+    path = "outputs/zoom_representatives.csv"
+    if threshold == 0.5 and os.path.exists(path):
+        picks = pd.read_csv(path, dtype={"key": str})
+    else:
+        picks = precompute_slice_representatives(apply_threshold(load_data(), threshold),
+                                                 {"version": "app_version_mapped"})
+    return picks[picks["slice"] == "version"]
+
 df = load_data()
 
+# ---------- Sentiment Threshold ----------
+threshold = st.sidebar.slider("Minimum confidence for POSITIVE/NEGATIVE", 0.5, 0.99, 0.5, 0.01,
+                              help="Reviews scored below this confidence are counted as NEUTRAL")
+df = apply_threshold(df, threshold)
+
 st.title("Sentiment Analysis Dashboard for Zoom")
 
 # ---------- Tabs ----------
@@ -92,18 +120,49 @@ with tabs[1]:
         st.image(wordcloud.to_array(), caption="Word Cloud of Complaint Terms", use_column_width=True)
 
     st.subheader("Representative Negative Reviews")
-    for i, row in df_version[df_version["sentiment"] == "NEGATIVE"].head(3).iterrows():
+    picks = load_representatives(threshold)
+    picks = picks[picks["key"] == str(selected_version)]
+    for i, row in df.loc[picks["row"]].iterrows():
         st.markdown(f"- \"{row['clean_review']}\"")
 
+    # Full-text search over the indexed reviews
+    st.subheader("🔍 Search Reviews")
+    index_path = "outputs/zoom_search.db"
+    if not os.path.exists(index_path):
+        st.info("No search index found — run test_sentiment_classification.py to build it.")
+    else:
+        query = st.text_input('Keywords or "exact phrase"', key="version_search")
+        col1, col2, col3 = st.columns(3)
+        scope_only = col1.checkbox("Only this version", value=True, key="version_scope")
+        sentiment_filter = col2.selectbox("Sentiment", ["Any", "NEGATIVE", "POSITIVE", "NEUTRAL"], key="version_sentiment")
+        page = col3.number_input("Page", min_value=1, value=1, step=1, key="version_page")
+        if query:
+            max_count = 10000
+            results, total = search_reviews(get_search_index(index_path), query,
+                                            version=selected_version if scope_only else None,
+                                            sentiment=None if sentiment_filter == "Any" else sentiment_filter,
+                                            threshold=threshold, page=page, max_count=max_count)
+            st.write(f"{total}{'+' if total >= max_count else ''} matches")
+            st.dataframe(results)
+
 # ---------- Tab 3: Weekly Frustration Timeline ----------
 with tabs[2]:
     st.header("3. Weekly Negative Timeline for Zoom")
-    weekly = df.groupby("week")["sentiment"].value_counts().unstack().fillna(0)
-    weekly["neg_percent"] = (weekly.get("NEGATIVE", 0) / weekly.sum(axis=1)) * 100
-    weekly = weekly.reset_index()
+    weekly = weekly_neg_percent(df)
 
     fig = px.line(weekly, x="week", y="neg_percent", markers=True,
                   title="% Negative Reviews Over Time (Weekly)",
                   labels={"neg_percent": "% Negative Reviews", "week": "Week"})
     fig.update_layout(template="plotly_white")
+
+    # Overlay detected spikes and change-points
+    events = detect_frustration_events({"Zoom": weekly}, load_version_config())
+    for kind, symbol, color in [("spike", "x", "red"), ("change_point", "diamond", "orange")]:
+        flagged = events[events["kind"] == kind]
+        fig.add_scatter(x=flagged["week"], y=flagged["neg_percent"], mode="markers",
+                        name=kind.replace("_", " ").title(),
+                        marker=dict(symbol=symbol, size=12, color=color))
     st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("🚨 Detected Spikes & Change-Points"):
+        st.dataframe(events)
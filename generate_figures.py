@@ -2,6 +2,7 @@ import pandas as pd
 import plotly.graph_objects as go
 import json
 import os
+from utils.change_points import detect_frustration_events
 
 # Load version data
 with open("config/app_versions.json") as f:
@@ -18,11 +19,12 @@ def process_app_data(file_path, app_name):
     df = pd.read_csv(file_path, parse_dates=["at"], low_memory=False)
     df["week"] = df["at"].dt.to_period("W").apply(lambda r: r.start_time)
     weekly_stats = df.groupby("week")["sentiment"].value_counts().unstack().fillna(0)
-    weekly_stats["negative_percent"] = (weekly_stats.get("NEGATIVE", 0) / weekly_stats.sum(axis=1)) * 100
+    weekly_stats["reviews"] = weekly_stats.sum(axis=1)
+    weekly_stats["negative_percent"] = (weekly_stats.get("NEGATIVE", 0) / weekly_stats["reviews"]) * 100
     weekly_stats.reset_index(inplace=True)
     return df, weekly_stats
 
-def plot_frustration_timeline(app_name, weekly_stats):
+def plot_frustration_timeline(app_name, weekly_stats, events):
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
@@ -52,6 +54,18 @@ def plot_frustration_timeline(app_name, weekly_stats):
             bgcolor="rgba(255,255,255,0.6)"
         )
 
+    # Overlay detected spikes and change-points
+    for kind, symbol, color in [("spike", "x", "red"), ("change_point", "diamond", "orange")]:
+        flagged = events[events["kind"] == kind]
+        if not flagged.empty:
+            fig.add_trace(go.Scatter(
+                x=flagged["week"],
+                y=flagged["neg_percent"],
+                mode='markers',
+                name=kind.replace("_", " ").title(),
+                marker=dict(symbol=symbol, size=12, color=color)
+            ))
+
     fig.update_layout(
         title=f"Frustration Timeline – {app_name}",
         xaxis_title="Week",
@@ -76,6 +90,13 @@ apps = {
     "Firefox": "outputs/firefox_final.csv"
 }
 
-for app_name, path in apps.items():
-    df, stats = process_app_data(path, app_name)
-    plot_frustration_timeline(app_name, stats)
+app_stats = {app_name: process_app_data(path, app_name)[1] for app_name, path in apps.items()}
+
+# Rank spikes and change-points across apps and save the table for review
+events = detect_frustration_events(app_stats, version_data, value_col="negative_percent")
+os.makedirs("outputs", exist_ok=True)
+events.to_csv("outputs/frustration_events.csv", index=False)
+print(f"✅ Saved: frustration_events.csv ({len(events)} events)")
+
+for app_name, stats in app_stats.items():
+    plot_frustration_timeline(app_name, stats, events[events["app"] == app_name])
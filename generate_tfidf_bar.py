@@ -1,12 +1,28 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.change_points import detect_frustration_events
+from utils.sentiment_labels import weekly_neg_percent
+from utils.version_labels import load_version_config
 
-def plot_tfidf_for_week(app_name, file_path, week_str):
-    print(f"🔍 Loading {app_name} reviews for week: {week_str}")
-
+def load_reviews(file_path):
     df = pd.read_csv(file_path, parse_dates=["at"], low_memory=False)
     df["week"] = df["at"].dt.to_period("W").apply(lambda r: r.start_time)
+    return df
+
+# Week of the highest-ranked detected spike, or None if nothing was flagged
+def top_spike_week(app_name, df):
+    events = detect_frustration_events({app_name: weekly_neg_percent(df)}, load_version_config())
+    spikes = events[events["kind"] == "spike"]
+    if spikes.empty:
+        return None
+    top = spikes.iloc[0]
+    print(f"📈 Top spike for {app_name}: week {top['week']:%Y-%m-%d} (z={top['score']:.1f}, "
+          f"nearest release {top['nearest_release']})")
+    return f"{top['week']:%Y-%m-%d}"
+
+def plot_tfidf_for_week(app_name, df, week_str):
+    print(f"🔍 Filtering {app_name} reviews for week: {week_str}")
 
     # Filter to the selected week and only NEGATIVE reviews
     week = pd.to_datetime(week_str)
@@ -33,9 +49,11 @@ def plot_tfidf_for_week(app_name, file_path, week_str):
     plt.tight_layout()
     plt.show()
 
-# 👉 Choose the app, file, and week here
+# 👉 Choose the app and file here; the week defaults to the top detected spike
 app_name = "Zoom"
 file_path = "outputs/zoom_final.csv"
-week_str = "2023-03-06"  # Use exact Monday date from your timeline spike
 
-plot_tfidf_for_week(app_name, file_path, week_str)
+df = load_reviews(file_path)
+week_str = top_spike_week(app_name, df) or "2023-03-06"  # fallback: exact Monday date from your timeline
+
+plot_tfidf_for_week(app_name, df, week_str)
@@ -0,0 +1,81 @@
+import csv
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+SAMPLE_REVIEWS = [
+    "the app keeps crashing every time i join a meeting",
+    "audio quality is great and setup was easy",
+    "screen sharing freezes after the latest update",
+    "login fails with an error since yesterday",
+    "works fine for daily calls no complaints",
+    "too many ads and the layout is confusing",
+]
+
+def load_texts(csv_path, limit=2000):
+    if not os.path.exists(csv_path):
+        return SAMPLE_REVIEWS
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        texts = [row["clean_review"] for row in csv.DictReader(f) if row.get("clean_review")]
+    return texts[:limit] or SAMPLE_REVIEWS
+
+def post_json(url, payload, timeout=60):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+def run_load_test(base_url, texts, concurrency=16, requests_per_worker=50, batch_size=1):
+    latencies, rejected, failed = [], [0], [0]
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(requests_per_worker):
+            sample = random.sample(texts, min(batch_size, len(texts)))
+            payload = {"text": sample[0]} if batch_size == 1 else {"texts": sample}
+            start = time.perf_counter()
+            try:
+                post_json(f"{base_url}/predict", payload)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except urllib.error.HTTPError as e:
+                with lock:
+                    if e.code == 503:
+                        rejected[0] += 1
+                    else:
+                        failed[0] += 1
+            except Exception:
+                with lock:
+                    failed[0] += 1
+
+    print(f"🚀 {concurrency} workers x {requests_per_worker} requests (batch size {batch_size})")
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ok = len(latencies)
+    def pct(p):
+        return latencies[min(ok - 1, int(p * ok))] * 1000 if ok else 0.0
+
+    print(f"✅ {ok} ok, {rejected[0]} rejected (503), {failed[0]} failed in {elapsed:.2f}s")
+    print(f"   Throughput: {ok * batch_size / elapsed:.1f} texts/s")
+    print(f"   Latency ms: p50={pct(0.50):.1f} p95={pct(0.95):.1f} p99={pct(0.99):.1f}")
+
+    with urllib.request.urlopen(f"{base_url}/metrics", timeout=10) as resp:
+        print("📊 Server metrics:", json.dumps(json.loads(resp.read()), indent=2))
+
+# 👉 Start the service first: python -m model.sentiment_server
+base_url = "http://127.0.0.1:8765"
+texts = load_texts("outputs/zoom_final.csv")
+
+run_load_test(base_url, texts, concurrency=16, requests_per_worker=50, batch_size=1)
+run_load_test(base_url, texts, concurrency=4, requests_per_worker=20, batch_size=16)
@@ -1,28 +1,53 @@
 from transformers import pipeline
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
+from utils.sentiment_labels import relabel_sentiments
 
 # Load sentiment pipeline (DistilBERT fine-tuned on SST-2)
 def load_sentiment_pipeline():
     return pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
 
-# Predict sentiment for a list of texts
-def predict_sentiments(texts, classifier):
-    results = []
-    for text in tqdm(texts, desc="Classifying sentiment"):
-        if not isinstance(text, str) or len(text.strip()) < 5:
-            results.append("NEUTRAL")
-            continue
-        try:
-            pred = classifier(text[:512])[0]  # truncate long reviews
-            label = pred["label"].upper()
-            results.append(label)
-        except:
-            results.append("NEUTRAL")
+# Score a batch of texts in one pipeline call, returning (label, score) pairs.
+# If the batch fails, texts are retried one by one so only the failing ones become NEUTRAL.
+def score_batch(texts, classifier, batch_size=32):
+    results = [("NEUTRAL", 0.0) for _ in texts]
+    keep = [i for i, text in enumerate(texts) if isinstance(text, str) and len(text.strip()) >= 5]
+    if not keep:
+        return results
+    try:
+        preds = classifier([texts[i][:512] for i in keep], batch_size=batch_size, truncation=True)
+    except Exception:
+        preds = []
+        for i in keep:
+            try:
+                preds.append(classifier(texts[i][:512], truncation=True)[0])
+            except Exception:
+                preds.append(None)
+    for i, pred in zip(keep, preds):
+        if pred is not None:
+            results[i] = (pred["label"].upper(), float(pred["score"]))
     return results
 
-# Apply to a DataFrame
-def classify_reviews(df, text_col="clean_review"):
+# Predict P(POSITIVE) as a compact float32 array (NaN for short or failed texts)
+def predict_positive_probs(texts, classifier, batch_size=32):
+    probs = np.full(len(texts), np.nan, dtype=np.float32)
+    for start in tqdm(range(0, len(texts), batch_size), desc="Scoring sentiment"):
+        scored = score_batch(texts[start:start + batch_size], classifier, batch_size=batch_size)
+        for offset, (label, score) in enumerate(scored):
+            if label == "POSITIVE":
+                probs[start + offset] = score
+            elif label == "NEGATIVE":
+                probs[start + offset] = 1 - score
+    return probs
+
+# Predict sentiment labels for a list of texts (same inference path as classify_reviews)
+def predict_sentiments(texts, classifier, threshold=0.5):
+    return list(relabel_sentiments(predict_positive_probs(texts, classifier), threshold))
+
+# Apply to a DataFrame; keep pos_prob so labels can be re-derived for any threshold
+def classify_reviews(df, text_col="clean_review", threshold=0.5):
     classifier = load_sentiment_pipeline()
-    df["sentiment"] = predict_sentiments(df[text_col].tolist(), classifier)
+    df["pos_prob"] = predict_positive_probs(df[text_col].tolist(), classifier)
+    df["sentiment"] = relabel_sentiments(df["pos_prob"].to_numpy(), threshold)
     return df
@@ -0,0 +1,202 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from model.distibert_sentiment import load_sentiment_pipeline, score_batch
+
+
+# Groups concurrent requests into micro-batches for a single warm classifier
+class MicroBatcher:
+    def __init__(self, classifier, max_batch_size=32, max_wait_ms=20, max_queue=256):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue(maxsize=max_queue)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.latencies = deque(maxlen=10000)
+        self.batch_sizes = deque(maxlen=10000)
+        self.counts = {"requests": 0, "texts": 0, "batches": 0, "rejected": 0}
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    # Queue a list of texts; raises queue.Full when the service is saturated
+    def submit(self, texts):
+        future = Future()
+        try:
+            self.requests.put_nowait((texts, future, time.perf_counter()))
+        except queue.Full:
+            with self.lock:
+                self.counts["rejected"] += 1
+            raise
+        return future
+
+    # Collect requests until the batch is full or the oldest one hits its deadline;
+    # requests already waiting are always taken, even past the deadline
+    def _next_batch(self):
+        batch = [self.requests.get()]
+        size = len(batch[0][0])
+        deadline = batch[0][2] + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    item = self.requests.get(timeout=remaining)
+                else:
+                    item = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for item in batch for text in item[0]]
+            try:
+                scored = score_batch(texts, self.classifier, batch_size=self.max_batch_size)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            offset = 0
+            with self.lock:
+                self.counts["batches"] += 1
+                self.batch_sizes.append(len(texts))
+                for item_texts, future, queued_at in batch:
+                    self.counts["requests"] += 1
+                    self.counts["texts"] += len(item_texts)
+                    self.latencies.append(now - queued_at)
+            for item_texts, future, _ in batch:
+                results = scored[offset:offset + len(item_texts)]
+                offset += len(item_texts)
+                future.set_result([{"label": label, "score": score} for label, score in results])
+
+    # Throughput and latency summary for the /metrics endpoint
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            batch_sizes = list(self.batch_sizes)
+            counts = dict(self.counts)
+        uptime = time.time() - self.started
+
+        def pct(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        counts.update({
+            "queue_depth": self.requests.qsize(),
+            "uptime_s": round(uptime, 1),
+            "texts_per_s": round(counts["texts"] / uptime, 2) if uptime > 0 else 0.0,
+            "mean_batch_size": round(sum(batch_sizes) / len(batch_sizes), 2) if batch_sizes else 0.0,
+            "latency_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99)},
+        })
+        return counts
+
+
+# ThreadingHTTPServer listens with a backlog of 5, so bursts get reset before they ever
+# reach the batcher; a backlog at least as deep as the batch queue lets 503s do the limiting
+class SentimentHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler, backlog=256):
+        self.request_queue_size = backlog
+        super().__init__(address, handler)
+
+
+def make_handler(batcher, max_request_texts=256, timeout_s=30):
+    class SentimentHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/metrics":
+                self._send(200, batcher.metrics())
+            else:
+                self._send(404, {"error": "not found"})
+
+        # Accepts {"text": "..."} or {"texts": ["...", ...]}
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"error": "invalid JSON"})
+                return
+
+            if not isinstance(payload, dict):
+                self._send(400, {"error": "expected a JSON object"})
+                return
+            single = "text" in payload
+            texts = [payload["text"]] if single else payload.get("texts")
+            if not isinstance(texts, list) or not texts:
+                self._send(400, {"error": "expected 'text' or a non-empty 'texts' list"})
+                return
+            if len(texts) > max_request_texts:
+                self._send(413, {"error": f"at most {max_request_texts} texts per request"})
+                return
+
+            try:
+                future = batcher.submit(texts)
+            except queue.Full:
+                self._send(503, {"error": "server busy, retry later"}, {"Retry-After": "1"})
+                return
+            try:
+                results = future.result(timeout=timeout_s)
+            except FutureTimeout:
+                self._send(504, {"error": "scoring timed out"})
+                return
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, results[0] if single else {"results": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return SentimentHandler
+
+
+def serve(host="127.0.0.1", port=8765, max_batch_size=32, max_wait_ms=20, max_queue=256):
+    print("🔄 Loading sentiment pipeline...")
+    batcher = MicroBatcher(load_sentiment_pipeline(), max_batch_size, max_wait_ms, max_queue)
+    server = SentimentHTTPServer((host, port), make_handler(batcher), backlog=max(max_queue, 128))
+    print(f"✅ Sentiment service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local DistilBERT sentiment scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=20)
+    parser.add_argument("--max-queue", type=int, default=256)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.max_queue)
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from utils.change_points import detect_events, detect_frustration_events
+
+WEEKS = pd.date_range("2019-01-07", periods=260, freq="W-MON")
+
+# Stationary noise should produce (almost) no spikes or change-points
+def test_noise_series_flags_roughly_nothing():
+    rng = np.random.default_rng(0)
+    apps = {f"app{i}": pd.DataFrame({"week": WEEKS, "neg_percent": rng.normal(25, 3, len(WEEKS)), "reviews": 100})
+            for i in range(100)}
+    events = detect_frustration_events(apps, regressions_only=False)
+    assert len(events) <= 20
+
+# A one-week outlier is a spike without change-points around it
+def test_single_outlier_is_only_a_spike():
+    rng = np.random.default_rng(1)
+    values = rng.normal(25, 3, len(WEEKS))
+    values[100] += 25
+    events = detect_events(pd.DataFrame({"week": WEEKS, "neg_percent": values, "reviews": 100}))
+    assert list(events["kind"]) == ["spike"]
+    assert events["week"].iloc[0] == WEEKS[100]
@@ -1,5 +1,7 @@
 import pandas as pd
 from model.distibert_sentiment import classify_reviews
+from utils.search_index import build_search_index
+from utils.representative_reviews import precompute_slice_representatives
 
 # Load the mapped datasets
 zoom_df = pd.read_csv("outputs/zoom_mapped.csv")
@@ -12,3 +14,9 @@ for app_name, df in [("Zoom", zoom_df), ("Webex", webex_df), ("Firefox", firefox
     df = classify_reviews(df, text_col="clean_review")
     df.to_csv(f"outputs/{app_name.lower()}_final.csv", index=False)
     print(f"✅ Done with {app_name}: saved to outputs/{app_name.lower()}_final.csv")
+    build_search_index(df, f"outputs/{app_name.lower()}_search.db")
+
+    # Representative negative reviews per week and version (default threshold) for the dashboards
+    weeks = pd.to_datetime(df["at"]).dt.to_period("W").dt.start_time
+    picks = precompute_slice_representatives(df.assign(week=weeks))
+    picks.to_csv(f"outputs/{app_name.lower()}_representatives.csv", index=False)
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+EVENT_COLUMNS = ["app", "week", "kind", "score", "neg_percent", "baseline", "version_window",
+                 "nearest_release", "release_date", "days_from_release"]
+
+# Robust noise estimate from week-over-week differences (insensitive to level shifts)
+def noise_sigma(values):
+    diffs = np.abs(np.diff(values))
+    if len(diffs) == 0:
+        return 0.0
+    sigma = np.median(diffs) / (0.6745 * np.sqrt(2))
+    return sigma if sigma > 0 else np.std(values)
+
+# z-score of each week against the mean of the preceding `window` weeks, plus that mean.
+# The scale is the series-wide robust noise_sigma (a few trailing weeks are too few to
+# estimate a std from), inflated for the uncertainty of the trailing mean itself.
+def rolling_zscores(values, window=8, min_periods=4):
+    values = np.asarray(values, dtype="float64")
+    idx = np.arange(len(values))
+    lo = np.maximum(idx - window, 0)
+    count = idx - lo
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    sigma = noise_sigma(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (sums[idx] - sums[lo]) / count
+        z = (values - mean) / (sigma * np.sqrt(1 + 1 / count))
+    z[(count < min_periods) | ~(sigma > 0)] = np.nan
+    return z, mean
+
+# Binary segmentation for mean shifts; returns (index, standardized shift) pairs where
+# index is the first week of the new level
+def binary_segmentation(values, penalty=None, min_size=3, max_change_points=10):
+    values = np.asarray(values, dtype="float64")
+    n = len(values)
+    sigma = noise_sigma(values)
+    if n < 2 * min_size or sigma == 0:
+        return []
+    if penalty is None:
+        penalty = 3 * np.log(n)
+
+    found = []
+    segments = [(0, n)]
+    while segments and len(found) < max_change_points:
+        best = None
+        for seg_index, (start, end) in enumerate(segments):
+            seg = values[start:end]
+            m = len(seg)
+            if m < 2 * min_size:
+                continue
+            # Cost reduction of splitting after k points, for every k at once
+            k = np.arange(min_size, m - min_size + 1)
+            left = np.cumsum(seg)[k - 1]
+            mean_left = left / k
+            mean_right = (seg.sum() - left) / (m - k)
+            gain = k * (m - k) / m * (mean_left - mean_right) ** 2 / sigma ** 2
+            i = int(np.argmax(gain))
+            if gain[i] > penalty and (best is None or gain[i] > best[0]):
+                shift = (mean_right[i] - mean_left[i]) / sigma
+                best = (gain[i], seg_index, start + int(k[i]), shift)
+        if best is None:
+            break
+        _, seg_index, split, shift = best
+        start, end = segments.pop(seg_index)
+        segments += [(start, split), (split, end)]
+        found.append((split, float(shift)))
+    return sorted(found)
+
+# Spike and change-point arrays (week, kind, score, neg_percent, baseline) for one series
+def _series_events(weeks, values, z_threshold=3.5, window=8, penalty=None):
+    z, baseline = rolling_zscores(values, window)
+    spikes = np.flatnonzero(z >= z_threshold)
+    # Clip spike weeks to their baseline so one-week outliers don't create change-points
+    level = values.copy()
+    level[spikes] = baseline[spikes]
+    change_points = binary_segmentation(level, penalty)
+    cp_idx = np.array([i for i, _ in change_points], dtype=int)
+    # A level shift that starts with a spike week is reported at the spike week itself
+    cp_idx = np.where(np.isin(cp_idx - 1, spikes), cp_idx - 1, cp_idx)
+    cp_shift = np.array([shift for _, shift in change_points], dtype="float64")
+
+    idx = np.concatenate([spikes, cp_idx])
+    kind = np.array(["spike"] * len(spikes) + ["change_point"] * len(cp_idx), dtype=object)
+    score = np.concatenate([z[spikes], cp_shift])
+    return weeks[idx], kind, score, values[idx], baseline[idx]
+
+# Release in effect and closest release (either side) for each event week
+def _attribute_releases(weeks, version_map):
+    n = len(weeks)
+    if not version_map or n == 0:
+        return (np.full(n, None, dtype=object), np.full(n, None, dtype=object),
+                np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]"), np.full(n, np.nan))
+
+    releases = sorted((pd.to_datetime(d), v) for v, d in version_map.items())
+    dates = np.array([d for d, _ in releases], dtype="datetime64[ns]")
+    names = np.array([v for _, v in releases], dtype=object)
+
+    pos = np.searchsorted(dates, weeks, side="right")
+    version_window = np.where(pos > 0, names[np.maximum(pos - 1, 0)], None)
+    prev_i = np.clip(pos - 1, 0, len(dates) - 1)
+    next_i = np.clip(pos, 0, len(dates) - 1)
+    use_next = np.abs(dates[next_i] - weeks) < np.abs(weeks - dates[prev_i])
+    nearest = np.where(use_next, next_i, prev_i)
+    days = (weeks - dates[nearest]) / np.timedelta64(1, "D")
+    return version_window, names[nearest], dates[nearest], days
+
+def _weekly_arrays(weekly, value_col, week_col, count_col, min_reviews):
+    weekly = weekly.sort_values(week_col)
+    if count_col in weekly.columns:
+        weekly = weekly[weekly[count_col] >= min_reviews]
+    weeks = weekly[week_col].to_numpy(dtype="datetime64[ns]")
+    return weeks, weekly[value_col].to_numpy(dtype="float64")
+
+# Flag spikes (rolling z-score) and level shifts (binary segmentation) in one weekly series
+def detect_events(weekly, value_col="neg_percent", week_col="week", count_col="reviews",
+                  z_threshold=3.5, window=8, min_reviews=20, penalty=None):
+    weeks, values = _weekly_arrays(weekly, value_col, week_col, count_col, min_reviews)
+    columns = _series_events(weeks, values, z_threshold, window, penalty)
+    return pd.DataFrame(dict(zip(["week", "kind", "score", "neg_percent", "baseline"], columns)))
+
+# Ranked table of spikes and change-points across apps, attributed to the nearest release.
+# `app_weekly` maps app name -> weekly frame with week / neg_percent (and optionally reviews).
+# Only regressions (rising frustration) are kept unless regressions_only=False, in which
+# case drops follow the regressions, largest drop last.
+def detect_frustration_events(app_weekly, version_config=None, value_col="neg_percent",
+                              week_col="week", count_col="reviews", z_threshold=3.5,
+                              window=8, min_reviews=20, penalty=None, regressions_only=True):
+    parts = []
+    for app_name, weekly in app_weekly.items():
+        weeks, values = _weekly_arrays(weekly, value_col, week_col, count_col, min_reviews)
+        events = _series_events(weeks, values, z_threshold, window, penalty)
+        releases = _attribute_releases(events[0], (version_config or {}).get(app_name, {}))
+        parts.append((np.full(len(events[0]), app_name, dtype=object),) + events + releases)
+
+    columns = [np.concatenate(col) for col in zip(*parts)] if parts else [[]] * len(EVENT_COLUMNS)
+    ranked = pd.DataFrame(dict(zip(EVENT_COLUMNS, columns)))
+    if regressions_only:
+        ranked = ranked[ranked["score"].astype("float64") > 0]
+    order = np.argsort(-ranked["score"].to_numpy(dtype="float64"), kind="stable")
+    ranked = ranked.iloc[order].reset_index(drop=True)
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+    return ranked
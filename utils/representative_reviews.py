@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Pick k rows of an L2-normalized TF-IDF matrix that sit close to the slice centroid
+# but differ from each other (maximal marginal relevance). Relevance is one sparse
+# mat-vec, and MMR only runs over the `pool_size` most central rows. Near-duplicates
+# of an already selected row are never picked.
+def select_representatives(X, k=3, diversity=0.3, pool_size=200, duplicate_threshold=0.95):
+    n = X.shape[0]
+    if n == 0 or k <= 0:
+        return np.array([], dtype=int)
+
+    centroid = np.asarray(X.mean(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if norm > 0:
+        centroid /= norm
+    relevance = X @ centroid
+
+    if n > pool_size:
+        pool = np.argpartition(-relevance, pool_size - 1)[:pool_size]
+    else:
+        pool = np.arange(n)
+    candidates = X[pool]
+    pool_relevance = relevance[pool]
+
+    selected = []
+    max_similarity = np.zeros(len(pool))
+    available = np.ones(len(pool), dtype=bool)
+    for _ in range(min(k, len(pool))):
+        if not available.any():
+            break
+        score = (1 - diversity) * pool_relevance - diversity * max_similarity
+        score[~available] = -np.inf
+        best = int(np.argmax(score))
+        selected.append(best)
+        available[best] = False
+        similarity = (candidates @ candidates[best].T).toarray().ravel()
+        max_similarity = np.maximum(max_similarity, similarity)
+        available &= similarity < duplicate_threshold
+    return pool[selected]
+
+# TF-IDF rows for the reviews with the given sentiment (one fit per app)
+def _sentiment_tfidf(df, text_col, sentiment):
+    subset = df[(df["sentiment"] == sentiment) & df[text_col].notna()]
+    if subset.empty:
+        return subset, None
+    try:
+        X = TfidfVectorizer(stop_words="english", sublinear_tf=True).fit_transform(subset[text_col])
+    except ValueError:  # only stop words left
+        return subset.iloc[:0], None
+    X = X.tocsr()
+
+    # Reviews made only of stop words have no terms to compare, so they can't be representative
+    has_terms = X.getnnz(axis=1) > 0
+    return subset[has_terms], X[has_terms]
+
+# (key, rank, df index label) picks for every group, skipping repeated texts within a group
+def _pick_per_group(subset, X, group_cols, k, diversity, text_col):
+    records = []
+    labels = subset.index.to_numpy()
+    first_copy = ~subset.duplicated(subset=group_cols + [text_col]).to_numpy()
+    for key, positions in subset.groupby(group_cols).indices.items():
+        key = key if isinstance(key, tuple) else (key,)
+        positions = positions[first_copy[positions]]
+        picks = positions[select_representatives(X[positions], k, diversity)]
+        records += [key + (rank, labels[pos]) for rank, pos in enumerate(picks, start=1)]
+    return records
+
+# Representative negative reviews for every slice (e.g. per week or per version).
+# Returns group key(s), rank and the df index label.
+def precompute_representatives(df, group_cols="week", k=3, text_col="clean_review",
+                               sentiment="NEGATIVE", diversity=0.3):
+    group_cols = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    columns = group_cols + ["rank", "row"]
+    subset, X = _sentiment_tfidf(df, text_col, sentiment)
+    if X is None:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame.from_records(_pick_per_group(subset, X, group_cols, k, diversity, text_col),
+                                     columns=columns)
+
+def _slice_key(key):
+    return key.strftime("%Y-%m-%d") if isinstance(key, pd.Timestamp) else str(key)
+
+# Picks for several slicings in one long table (slice, key, rank, row) from a single
+# TF-IDF fit; this is what the scoring pipeline persists for the dashboards
+def precompute_slice_representatives(df, slices=None, k=3, text_col="clean_review",
+                                     sentiment="NEGATIVE", diversity=0.3):
+    slices = slices or {"week": "week", "version": "app_version_mapped"}
+    columns = ["slice", "key", "rank", "row"]
+    subset, X = _sentiment_tfidf(df, text_col, sentiment)
+    if X is None:
+        return pd.DataFrame(columns=columns)
+
+    records = []
+    for name, col in slices.items():
+        if col in subset.columns:
+            picks = _pick_per_group(subset, X, [col], k, diversity, text_col)
+            records += [(name, _slice_key(key), rank, row) for key, rank, row in picks]
+    return pd.DataFrame.from_records(records, columns=columns)
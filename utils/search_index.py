@@ -0,0 +1,136 @@
+import os
+import re
+import numpy as np
+import sqlite3
+import pandas as pd
+from utils.sentiment_labels import CONFIDENCE_EPSILON
+
+SCHEMA = """
+CREATE TABLE reviews (
+    id INTEGER PRIMARY KEY,
+    week TEXT,
+    version TEXT,
+    sentiment TEXT,
+    pos_prob REAL,
+    clean_review TEXT,
+    facets TEXT,
+    content TEXT
+);
+CREATE VIRTUAL TABLE reviews_fts USING fts5(
+    clean_review, facets, content='reviews', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+# Same thresholding (and tolerance) as utils.sentiment_labels.relabel_sentiments, in SQL
+SENTIMENT_SQL = f"""CASE
+    WHEN r.pos_prob IS NULL THEN r.sentiment
+    WHEN r.pos_prob >= 0.5 AND r.pos_prob >= :threshold - {CONFIDENCE_EPSILON} THEN 'POSITIVE'
+    WHEN r.pos_prob < 0.5 AND 1 - r.pos_prob >= :threshold - {CONFIDENCE_EPSILON} THEN 'NEGATIVE'
+    ELSE 'NEUTRAL' END"""
+
+# Week and version are indexed as tokens in a separate FTS column so filters are
+# posting-list intersections instead of per-row checks
+def week_token(week):
+    return "w" + pd.to_datetime(week).strftime("%Y%m%d")
+
+def version_token(version):
+    return "v" + str(version).encode("utf-8").hex()
+
+# Build (or rebuild) the on-disk full-text index for one app's reviews
+def build_search_index(df, db_path, text_col="clean_review", version_col="app_version_mapped"):
+    if "week" in df.columns:
+        weeks = pd.to_datetime(df["week"])
+    else:
+        weeks = pd.to_datetime(df["at"]).dt.to_period("W").dt.start_time
+
+    if version_col in df.columns:
+        versions = df[version_col].astype(object).where(df[version_col].notna(), "").astype(str)
+    else:
+        versions = pd.Series("", index=df.index)
+    rows = pd.DataFrame({
+        "week": weeks.dt.strftime("%Y-%m-%d"),
+        "version": versions,
+        "sentiment": df["sentiment"] if "sentiment" in df.columns else None,
+        "pos_prob": df["pos_prob"].astype(float) if "pos_prob" in df.columns else None,
+        "clean_review": df[text_col],
+        "facets": "w" + weeks.dt.strftime("%Y%m%d") + " " + versions.map(version_token),
+        "content": df["content"] if "content" in df.columns else df[text_col],
+    })
+    rows = rows[rows["clean_review"].notna()]
+    # Insert oldest first so rowid order is date order (newest matches = highest rowids)
+    rows = rows.iloc[np.argsort(weeks.loc[rows.index].to_numpy(), kind="stable")]
+    rows = rows.astype(object).where(rows.notna(), None)
+
+    # Write to a temp file and swap it in so readers never see a half-built index
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO reviews (week, version, sentiment, pos_prob, clean_review, facets, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows.itertuples(index=False, name=None),
+        )
+        conn.execute("INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO reviews_fts(reviews_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    print(f"✅ Indexed {len(rows)} reviews into {db_path}")
+
+# Read-only connection that can be shared across Streamlit reruns
+def open_search_index(db_path):
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+
+# Turn user input into an FTS5 query: "quoted phrases" stay phrases, words are ANDed,
+# a * attached to the end of a word keeps prefix matching; everything else is escaped
+def to_fts_query(text):
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text.lower()):
+        if phrase:
+            tokens = re.findall(r"\w+", phrase)
+            if tokens:
+                terms.append('"' + " ".join(tokens) + '"')
+            continue
+        tokens = re.findall(r"\w+", word)
+        terms += [f'"{token}"' for token in tokens]
+        if tokens and re.search(r"\w\*$", word):
+            terms[-1] += "*"
+    return " ".join(terms)
+
+# BM25-ranked keyword/phrase search with optional week/version/sentiment filters.
+# Returns (page of results, number of matches capped at max_count); both honour every
+# filter. Very common terms are ranked among their `max_ranked` most recent matches,
+# which bounds the BM25 work per query.
+def search_reviews(conn, query, week=None, version=None, sentiment=None, threshold=0.5,
+                   page=1, page_size=20, max_count=10000, max_ranked=10000):
+    fts_query = to_fts_query(query)
+    if not fts_query:
+        return pd.DataFrame(columns=["week", "version", "sentiment", "content", "rank"]), 0
+
+    match = f"clean_review : ({fts_query})"
+    if week is not None:
+        match += f" AND facets : {week_token(week)}"
+    if version is not None:
+        match += f" AND facets : {version_token(version)}"
+
+    params = {"query": match, "threshold": threshold, "sentiment": sentiment, "max_ranked": max_ranked,
+              "max_count": max_count, "limit": page_size, "offset": (max(page, 1) - 1) * page_size}
+    # Matching rows; the sentiment filter needs pos_prob, so it is applied through the join
+    # before any cap, otherwise a rare sentiment could be cut off by the recency limit
+    matches = "FROM reviews_fts WHERE reviews_fts MATCH :query"
+    if sentiment is not None:
+        matches = ("FROM reviews_fts CROSS JOIN reviews r ON r.id = reviews_fts.rowid "
+                   f"WHERE reviews_fts MATCH :query AND ({SENTIMENT_SQL}) = :sentiment")
+
+    total = conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 {matches} LIMIT :max_count)", params).fetchone()[0]
+    # Rank inside FTS5 (facets weighted 0) and only join the rows that are returned
+    candidates = (f"SELECT reviews_fts.rowid AS id, reviews_fts.rank {matches} "
+                  "AND reviews_fts.rank MATCH 'bm25(1.0, 0.0)' ORDER BY reviews_fts.rowid DESC LIMIT :max_ranked")
+    sql = (f"SELECT r.week, r.version, {SENTIMENT_SQL} AS sentiment, r.content, f.rank "
+           f"FROM (SELECT * FROM ({candidates}) ORDER BY rank LIMIT :limit OFFSET :offset) f "
+           "JOIN reviews r ON r.id = f.id ORDER BY f.rank")
+    return pd.read_sql_query(sql, conn, params=params), total
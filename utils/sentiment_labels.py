@@ -0,0 +1,29 @@
+import numpy as np
+
+SENTIMENT_LABELS = np.array(["NEGATIVE", "NEUTRAL", "POSITIVE"], dtype=object)
+
+# Tolerance for threshold comparisons so float32 (numpy) and float64 (SQLite) agree
+CONFIDENCE_EPSILON = 1e-6
+
+# Derive POSITIVE/NEGATIVE/NEUTRAL from stored P(POSITIVE) for any confidence threshold.
+# Missing probabilities (short or failed texts) and predictions below the threshold are NEUTRAL.
+def relabel_sentiments(pos_probs, threshold=0.5):
+    probs = np.asarray(pos_probs, dtype=np.float32)
+    confidence = np.maximum(probs, 1 - probs)
+    codes = np.where(probs >= 0.5, 2, 0).astype(np.int8)
+    codes[~(confidence >= threshold - CONFIDENCE_EPSILON)] = 1
+    return SENTIMENT_LABELS[codes]
+
+# Overwrite the sentiment column from pos_prob (older outputs without it are left unchanged)
+def apply_threshold(df, threshold=0.5):
+    if "pos_prob" in df.columns:
+        df["sentiment"] = relabel_sentiments(df["pos_prob"].to_numpy(), threshold)
+    return df
+
+# Weekly % of labelled reviews that are NEGATIVE, with the number of reviews per week
+def weekly_neg_percent(df, week_col="week"):
+    labelled = df[df["sentiment"].notna()]
+    weekly = labelled["sentiment"].eq("NEGATIVE").groupby(labelled[week_col]).agg(["mean", "size"])
+    weekly = weekly.rename(columns={"mean": "neg_percent", "size": "reviews"})
+    weekly["neg_percent"] *= 100
+    return weekly.reset_index()